@@ -2,14 +2,37 @@
 
 import logging
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL, Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.typing import ConfigType
 
 from .api_client import StairsApiClient
-from .const import DOMAIN
-from .light import Stairs
+from .const import (
+    ATTR_DURATION,
+    CONF_COLOR_CORRECTION,
+    CONF_GAMMA,
+    CONF_PACKED_COLORS,
+    DEFAULT_COLOR_CORRECTION,
+    DEFAULT_GAMMA,
+    DEFAULT_PROFILE_DURATION,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MAX_PROFILE_DURATION,
+    SERVICE_PROFILE,
+)
+from .light import Stairs, async_set_strip_count
+from .profiler import StairsProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +44,56 @@ PLATFORMS: list[Platform] = [Platform.LIGHT]
 # Rename type alias and update all entry annotations
 type StairsConfigEntry = ConfigEntry[Stairs]  # noqa: F821
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_DURATION)
+        ),
+    }
+)
+
+
+async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+    """Profiluje pętlę odpytywania i komendy, wynik trafia do diagnostyki."""
+    hass = call.hass
+    if not hass.data.get(DOMAIN):
+        raise ServiceValidationError("Brak załadowanych wpisów integracji Stairs")
+
+    report = await StairsProfiler(hass).async_run(call.data[ATTR_DURATION])
+
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        entry_data["profile"] = report
+
+    return report
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Zarejestruj usługi integracji."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    return True
+
+
+def _entry_config(entry: ConfigEntry) -> dict:
+    """Zwraca konfigurację wpisu, w której opcje nadpisują dane początkowe."""
+    return {**entry.data, **entry.options}
+
+
+def _apply_color_settings(api_client: StairsApiClient, config: dict) -> None:
+    """Przekaż klientowi ustawienia korekcji kolorów z konfiguracji wpisu."""
+    api_client.update_color_settings(
+        config.get(CONF_PACKED_COLORS, False),
+        config.get(CONF_GAMMA, DEFAULT_GAMMA),
+        config.get(CONF_COLOR_CORRECTION, DEFAULT_COLOR_CORRECTION),
+    )
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -28,9 +101,10 @@ async def async_setup_entry(
 ) -> bool:
     """Skonfiguruj platformę z wpisu konfiguracyjnego."""
     _LOGGER.info("Uruchamiam async_setup_entry")
-    host = entry.data[CONF_HOST]
-    port = entry.data[CONF_PORT]
-    num_led_strips = entry.data["led_strips"]
+    config = _entry_config(entry)
+    host = config[CONF_HOST]
+    port = config[CONF_PORT]
+    num_led_strips = config["led_strips"]
 
     _LOGGER.info(
         "Konfiguruję platformę %s dla hosta %s i portu %s, liczba pasków LED: %s",
@@ -41,7 +115,8 @@ async def async_setup_entry(
     )
 
     session = async_get_clientsession(hass)
-    api_client = StairsApiClient(host, port, session)
+    api_client = StairsApiClient(hass, host, port, session)
+    _apply_color_settings(api_client, config)
 
     if DOMAIN not in hass.data:
         hass.data[DOMAIN] = {}
@@ -49,17 +124,42 @@ async def async_setup_entry(
     hass.data[DOMAIN][entry.entry_id] = {
         "api_client": api_client,
         "entities": [Stairs(hass, api_client, i) for i in range(num_led_strips)],
+        "scan_interval": config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
     }
 
-    # entry.runtime_data = Stairs(hass, api_client, 0)
+    await hass.config_entries.async_forward_entry_setup(entry, "light")
+
+    # Zmiany opcji stosujemy w miejscu, bez przeładowania całego wpisu
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
-    # hass.data[DOMAIN][config_entry.entry_id] = api_client
+    return True
 
-    # async_add_entities([Stairs(hass, host, port, i) for i in range(num_led_strips)])
 
-    await hass.config_entries.async_forward_entry_setup(entry, "light")
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Zastosuj zmienione opcje bez usuwania encji i klienta API."""
+    config = _entry_config(entry)
+    entry_data = hass.data[DOMAIN][entry.entry_id]
 
-    return True
+    _LOGGER.info(
+        "Aktualizuję opcje %s: host %s, port %s, liczba pasków LED: %s",
+        DOMAIN,
+        config[CONF_HOST],
+        config[CONF_PORT],
+        config["led_strips"],
+    )
+
+    entry_data["api_client"].update_endpoint(config[CONF_HOST], config[CONF_PORT])
+    if entry.unique_id != config[CONF_HOST]:
+        # unique_id i tytuł to host z async_step_user; aktualizacja wywoła ten
+        # listener ponownie, ale wtedy warunek już nie jest spełniony
+        hass.config_entries.async_update_entry(
+            entry, title=config[CONF_HOST], unique_id=config[CONF_HOST]
+        )
+    _apply_color_settings(entry_data["api_client"], config)
+    # Pętla odpytywania odczytuje interwał przy planowaniu kolejnego cyklu
+    entry_data["scan_interval"] = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+
+    await async_set_strip_count(hass, entry, config["led_strips"])
 
 
 # Update entry annotation
@@ -1,21 +1,62 @@
 """Klient API dla integracji Stairs."""
 
+import asyncio
 import logging
 
 import aiohttp
 
+from homeassistant.core import HomeAssistant
+
+from .color import ColorCorrection
+from .const import DEFAULT_COLOR_CORRECTION, DEFAULT_GAMMA
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class StairsApiClient:
     """Klasa klienta API do komunikacji z API."""
 
-    def __init__(self, host, port, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self, hass: HomeAssistant, host, port, session: aiohttp.ClientSession
+    ) -> None:
         """Inicjalizacja klienta API."""
+        self._hass = hass
         self._host = host
         self._port = port
         self._base_url = f"http://{host}:{port}/api"
         self.session = session
+        # Tryb spakowany: kolor przeskalowany jasnością liczony po stronie HA
+        self.packed_colors = False
+        self.color_correction = ColorCorrection(DEFAULT_GAMMA, DEFAULT_COLOR_CORRECTION)
+        self._pending_colors: dict[int, tuple] = {}
+        # Wysyłka zbierająca nowe kolory oraz ostatnia uruchomiona wysyłka
+        self._color_flush: asyncio.Task | None = None
+        self._last_color_flush: asyncio.Task | None = None
+
+    def update_endpoint(self, host, port) -> None:
+        """Przełącz klienta na nowy adres kontrolera.
+
+        Zmiana następuje między żądaniami: żądania w toku kończą się na starym
+        adresie, każde kolejne trafia już pod nowy. Współdzielona sesja HA
+        utrzymuje osobną pulę połączeń dla każdego hosta, więc połączenia do
+        starego adresu po prostu wygasają.
+        """
+        if (host, port) == (self._host, self._port):
+            return
+        _LOGGER.info("Zmieniam adres API na %s:%s", host, port)
+        self._host = host
+        self._port = port
+        self._base_url = f"http://{host}:{port}/api"
+
+    def update_color_settings(self, packed_colors, gamma, correction) -> None:
+        """Ustaw tryb spakowany i przebuduj tablice korekcji, jeśli się zmieniły."""
+        self.packed_colors = packed_colors
+        correction = tuple(correction)
+        if (gamma, correction) != (
+            self.color_correction.gamma,
+            self.color_correction.correction,
+        ):
+            self.color_correction = ColorCorrection(gamma, correction)
 
     async def async_set_solid_color(self, strip_number, rgb):
         """Ustaw jednolity kolor.
@@ -36,7 +77,7 @@ class StairsApiClient:
         try:
             async with self.session.post(url, json=payload) as response:
                 if response.status == 200:
-                    _LOGGER.info("Ustawiono kolor %s na pasku %s", rgb, strip_number)
+                    _LOGGER.debug("Ustawiono kolor %s na pasku %s", rgb, strip_number)
                 else:
                     _LOGGER.error(
                         "Błąd podczas ustawiania koloru na pasku %s: %s",
@@ -59,7 +100,7 @@ class StairsApiClient:
         try:
             async with self.session.post(url, json=payload) as response:
                 if response.status == 200:
-                    _LOGGER.info(
+                    _LOGGER.debug(
                         "Ustawiono jasność %s na pasku %s", brightness, strip_number
                     )
                 else:
@@ -75,6 +116,77 @@ class StairsApiClient:
                 e,
             )
 
+    async def async_set_color(self, strip_number, rgb, brightness):
+        """Ustaw kolor przeskalowany jasnością w trybie spakowanym.
+
+        Wywołania z tej samej iteracji pętli zdarzeń (np. grupa świateł)
+        są łączone w jedno żądanie dla wielu pasków.
+        """
+        self._pending_colors[strip_number] = (rgb, brightness)
+        if self._color_flush is None:
+            self._color_flush = self._hass.async_create_background_task(
+                self._async_flush_colors(self._last_color_flush),
+                name="stairs color flush",
+            )
+            self._last_color_flush = self._color_flush
+        # Anulowanie jednego wywołania nie może przerwać wysyłki pozostałych
+        await asyncio.shield(self._color_flush)
+
+    async def _async_flush_colors(self, previous: asyncio.Task | None):
+        """Wysyła zebrane kolory jednym żądaniem w kodowaniu hex.
+
+        Wysyłka czeka na zakończenie poprzedniej, aby kolejne kolory tego
+        samego paska docierały do kontrolera w kolejności.
+        """
+        try:
+            # Dajemy pozostałym encjom szansę dopisania się do tej wysyłki
+            await asyncio.sleep(0)
+            if previous is not None and not previous.done():
+                await asyncio.wait((previous,))
+            pending, self._pending_colors = self._pending_colors, {}
+        finally:
+            # Po anulowaniu niewysłane kolory zabierze następna wysyłka
+            self._color_flush = None
+
+        if not pending:
+            return
+        strip_numbers = []
+        colors = []
+        for strip_number in sorted(pending):
+            # Błędny kolor jednego paska nie może zablokować pozostałych
+            try:
+                colors.append(self.color_correction.encode((pending[strip_number],)))
+            except (TypeError, ValueError, IndexError) as e:
+                _LOGGER.error(
+                    "Nieprawidłowy kolor %s dla paska %s: %s",
+                    pending[strip_number],
+                    strip_number,
+                    e,
+                )
+                continue
+            strip_numbers.append(strip_number)
+        if not strip_numbers:
+            return
+
+        url = f"{self._base_url}/animation/solidcolor/packed"
+        payload = {"step_numbers": strip_numbers, "colors": "".join(colors)}
+        try:
+            async with self.session.post(url, json=payload) as response:
+                if response.status == 200:
+                    _LOGGER.debug("Ustawiono kolory na paskach %s", strip_numbers)
+                else:
+                    _LOGGER.error(
+                        "Błąd podczas ustawiania kolorów na paskach %s: %s",
+                        strip_numbers,
+                        response.status,
+                    )
+        except aiohttp.ClientError as e:
+            _LOGGER.error(
+                "Błąd połączenia z API podczas ustawiania kolorów na paskach %s: %s",
+                strip_numbers,
+                e,
+            )
+
     async def async_check_availability(self):
         """Sprawdza dostępność API."""
         try:
@@ -103,7 +215,7 @@ class StairsApiClient:
             ) as resp:
                 if resp.status == 200:
                     data = await resp.json()
-                    _LOGGER.info("Otrzymano status: %s", data)
+                    _LOGGER.debug("Otrzymano status: %s", data)
                     return data
                 _LOGGER.error(
                     "Błąd podczas pobierania statusu dla paska %s: %s",
@@ -111,7 +223,7 @@ class StairsApiClient:
                     resp.status,
                 )
                 return None
-        except aiohttp.ClientError as e:
+        except (TimeoutError, ValueError, aiohttp.ClientError) as e:
             _LOGGER.error(
                 "Błąd połączenia z API podczas aktualizacji paska %s: %s",
                 strip_number,
@@ -126,7 +238,7 @@ class StairsApiClient:
         try:
             async with self.session.post(url, json=payload) as response:
                 if response.status == 200:
-                    _LOGGER.info("Włączono pasek %s", strip_number)
+                    _LOGGER.debug("Włączono pasek %s", strip_number)
                 else:
                     _LOGGER.error(
                         "Błąd podczas włączania paska %s: %s",
@@ -145,7 +257,7 @@ class StairsApiClient:
         try:
             async with self.session.post(url, json=payload) as response:
                 if response.status == 200:
-                    _LOGGER.info("Wyłączono pasek %s", strip_number)
+                    _LOGGER.debug("Wyłączono pasek %s", strip_number)
                 else:
                     _LOGGER.error(
                         "Błąd podczas wyłączania paska %s: %s",
@@ -164,7 +276,9 @@ class StairsApiClient:
         try:
             async with self.session.post(url, json=payload) as response:
                 if response.status == 200:
-                    _LOGGER.info("Ustawiono efekt %s na pasku %s", effect, strip_number)
+                    _LOGGER.debug(
+                        "Ustawiono efekt %s na pasku %s", effect, strip_number
+                    )
                 else:
                     _LOGGER.error(
                         "Błąd podczas ustawiania efektu na pasku %s: %s",
@@ -190,7 +304,7 @@ class StairsApiClient:
                     "Błąd podczas pobierania statusu wszystkich pasków: %s", resp.status
                 )
                 return None
-        except aiohttp.ClientError as e:
+        except (TimeoutError, ValueError, aiohttp.ClientError) as e:
             _LOGGER.error(
                 "Błąd połączenia z API podczas pobierania statusu wszystkich pasków: %s",
                 e,
@@ -0,0 +1,67 @@
+"""Tablice korekcji gamma i kolorów oraz kompaktowe kodowanie kolorów."""
+
+from collections.abc import Iterable
+from itertools import chain
+
+
+def _gamma_table(gamma: float, scale: float) -> tuple[float, ...]:
+    """Buduje tablicę 256 wartości `scale * (i / 255) ** gamma` bez kwantyzacji."""
+    return tuple(scale * (i / 255) ** gamma for i in range(256))
+
+
+def _quantize(values: tuple[float, float, float]) -> tuple[int, int, int]:
+    """Zaokrągla kolor do 8 bitów na kanał.
+
+    Jeśli wszystkie kanały zaokrąglają się do 0, najjaśniejszy dostaje 1,
+    żeby pasek przy niskiej jasności nie gasł skokowo. Pozostałe kanały są
+    zwykle zaokrąglane, więc odcień nie przesuwa się w stronę słabszych
+    kanałów.
+    """
+    quantized = [round(value) for value in values]
+    brightest = max(values)
+    if brightest > 0 and not any(quantized):
+        quantized[values.index(brightest)] = 1
+    return tuple(quantized)
+
+
+class ColorCorrection:
+    """Wstępnie obliczone tablice korekcji kolorów dla jednego kontrolera.
+
+    Korekcja gamma jest stosowana osobno do koloru i do jasności
+    (`(c * b) ** g == c ** g * b ** g`), a wynik jest kwantyzowany do 8 bitów
+    tylko raz, więc niskie jasności zachowują pełną rozdzielczość. Kontroler
+    dostaje gotowe wartości i nie musi niczego przeliczać.
+    """
+
+    def __init__(self, gamma: float, correction: Iterable[int]) -> None:
+        """Inicjalizacja tablic.
+
+        Args:
+            gamma: Wykładnik korekcji gamma.
+            correction: Maksymalna wartość (0-255) każdego kanału RGB.
+
+        """
+        self.gamma = gamma
+        self.correction = tuple(correction)
+        self._brightness_table = _gamma_table(gamma, 1.0)
+        self._channel_tables = tuple(
+            _gamma_table(gamma, channel_max) for channel_max in self.correction
+        )
+
+    def apply(self, rgb: Iterable[int], brightness: int) -> tuple[int, int, int]:
+        """Zwraca kolor przeskalowany jasnością po korekcji gamma i kolorów."""
+        red, green, blue = rgb
+        red_table, green_table, blue_table = self._channel_tables
+        factor = self._brightness_table[brightness]
+        return _quantize(
+            (
+                red_table[red] * factor,
+                green_table[green] * factor,
+                blue_table[blue] * factor,
+            )
+        )
+
+    def encode(self, colors: Iterable[tuple[Iterable[int], int]]) -> str:
+        """Koduje pary (kolor, jasność) jako ciąg hex `rrggbb` na każdy pasek."""
+        values = (self.apply(rgb, brightness) for rgb, brightness in colors)
+        return bytes(chain.from_iterable(values)).hex()
@@ -3,11 +3,25 @@
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
-from homeassistant.helpers import config_validation as cv
-
-from .const import DEFAULT_HOST, DEFAULT_NUM_STRIPS, DEFAULT_PORT, DOMAIN
+from homeassistant.helpers import config_validation as cv, selector
+
+from .const import (
+    CONF_COLOR_CORRECTION,
+    CONF_GAMMA,
+    CONF_PACKED_COLORS,
+    DEFAULT_COLOR_CORRECTION,
+    DEFAULT_GAMMA,
+    DEFAULT_HOST,
+    DEFAULT_NUM_STRIPS,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MAX_NUM_STRIPS,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+)
 
 DATA_SCHEMA = vol.Schema(
     {
@@ -41,7 +55,7 @@ class StairsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             elif not (0 < user_input[CONF_PORT] < 65536):
                 errors["base"] = "no_port"
 
-            elif not (0 < user_input["led_strips"] <= 100):
+            elif not (0 < user_input["led_strips"] <= MAX_NUM_STRIPS):
                 errors["base"] = "invalid_strip_number"
 
             if not errors:
@@ -74,23 +88,65 @@ class StairsOptionsFlowHandler(config_entries.OptionsFlow):
         self.config_entry = config_entry
 
     async def async_step_init(self, user_input=None) -> config_entries.ConfigFlowResult:
-        """Manage the options."""
+        """Manage the options.
+
+        Zmiany są stosowane w miejscu przez listener aktualizacji wpisu,
+        bez przeładowania integracji.
+        """
+        errors = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Host jest unique_id wpisu, nie może pokrywać się z innym wpisem
+            if any(
+                entry.unique_id == user_input[CONF_HOST]
+                for entry in self.hass.config_entries.async_entries(DOMAIN)
+                if entry.entry_id != self.config_entry.entry_id
+            ):
+                errors["base"] = "already_configured"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        # Aktualne wartości: opcje nadpisują dane z pierwszej konfiguracji
+        current = {
+            **self.config_entry.data,
+            **self.config_entry.options,
+            **(user_input or {}),
+        }
 
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
                 {
+                    vol.Optional(CONF_HOST, default=current.get(CONF_HOST)): cv.string,
+                    vol.Optional(CONF_PORT, default=current.get(CONF_PORT)): cv.port,
+                    vol.Optional(
+                        "led_strips", default=current.get("led_strips")
+                    ): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_NUM_STRIPS)
+                    ),
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL,
+                        default=current.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+                    ),
+                    # Korekcja gamma i kolorów liczona w HA, wymaga obsługi
+                    # spakowanych kolorów przez kontroler
                     vol.Optional(
-                        CONF_HOST, default=self.config_entry.data.get(CONF_HOST)
-                    ): cv.string,
+                        CONF_PACKED_COLORS,
+                        default=current.get(CONF_PACKED_COLORS, False),
+                    ): cv.boolean,
                     vol.Optional(
-                        CONF_PORT, default=self.config_entry.data.get(CONF_PORT)
-                    ): cv.port,
+                        CONF_GAMMA, default=current.get(CONF_GAMMA, DEFAULT_GAMMA)
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=3.0)),
                     vol.Optional(
-                        "led_strips", default=self.config_entry.data.get("led_strips")
-                    ): cv.positive_int,
+                        CONF_COLOR_CORRECTION,
+                        default=current.get(
+                            CONF_COLOR_CORRECTION, DEFAULT_COLOR_CORRECTION
+                        ),
+                    ): selector.ColorRGBSelector(),
                 }
             ),
+            errors=errors,
         )
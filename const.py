@@ -4,3 +4,18 @@ DOMAIN = "stairs"
 DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 5000
 DEFAULT_NUM_STRIPS = 16
+
+SERVICE_PROFILE = "profile"
+ATTR_DURATION = "duration"
+DEFAULT_PROFILE_DURATION = 30
+MAX_PROFILE_DURATION = 600
+DEFAULT_SCAN_INTERVAL = 5
+MIN_SCAN_INTERVAL = 2
+MAX_SCAN_INTERVAL = 300
+MAX_NUM_STRIPS = 100
+
+CONF_PACKED_COLORS = "packed_colors"
+CONF_GAMMA = "gamma"
+CONF_COLOR_CORRECTION = "color_correction"
+DEFAULT_GAMMA = 2.2
+DEFAULT_COLOR_CORRECTION = [255, 255, 255]
@@ -0,0 +1,27 @@
+"""Diagnostyka dla integracji Stairs."""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+# Tytuł i unique_id wpisu to również adres kontrolera
+TO_REDACT = {CONF_HOST, "title", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Zwraca dane diagnostyczne wpisu konfiguracyjnego."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "entities": len(entry_data["entities"]),
+        # Wynik ostatniego wywołania usługi stairs.profile
+        "profile": entry_data.get("profile"),
+    }
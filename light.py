@@ -1,6 +1,5 @@
 """Main entity instance."""
 
-from datetime import timedelta
 import logging
 
 import aiohttp
@@ -16,10 +15,11 @@ from homeassistant.components.light import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, STATE_ON, STATE_UNAVAILABLE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .api_client import StairsApiClient
@@ -46,13 +46,44 @@ async def async_setup_entry(
     """Skonfiguruj platformę światła z wpisu konfiguracyjnego."""
     _LOGGER.info("Uruchamiam async_setup_entry dla light")
 
-    api_client = hass.data[DOMAIN][config_entry.entry_id]["api_client"]
-    entities = hass.data[DOMAIN][config_entry.entry_id]["entities"]
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    # Zapamiętujemy callback, aby móc dodawać encje po zmianie opcji
+    entry_data["add_entities"] = async_add_entities
 
-    async_add_entities(entities)
+    async_add_entities(entry_data["entities"])
 
-    # Uruchom pętlę aktualizacji dla wszystkich encji
-    await start_global_update_loop(hass, entities)
+    # Uruchom pętlę aktualizacji dla wszystkich encji, zatrzymywaną przy wyładowaniu
+    config_entry.async_on_unload(start_global_update_loop(hass, entry_data))
+
+
+async def async_set_strip_count(
+    hass: HomeAssistant, config_entry: ConfigEntry, num_led_strips: int
+) -> None:
+    """Dodaje lub usuwa tylko te encje, których dotyczy zmiana liczby pasków."""
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    entities = entry_data["entities"]
+    current = len(entities)
+
+    if num_led_strips > current:
+        new_entities = [
+            Stairs(hass, entry_data["api_client"], i)
+            for i in range(current, num_led_strips)
+        ]
+        entities.extend(new_entities)
+        entry_data["add_entities"](new_entities)
+        _LOGGER.info("Dodano %s pasków LED", len(new_entities))
+
+    elif num_led_strips < current:
+        removed = entities[num_led_strips:]
+        # Najpierw odłączamy encje od pętli aktualizacji, potem usuwamy je z HA
+        del entities[num_led_strips:]
+        registry = er.async_get(hass)
+        for entity in removed:
+            entity_id = entity.entity_id
+            await entity.async_remove(force_remove=True)
+            if entity_id and registry.async_get(entity_id):
+                registry.async_remove(entity_id)
+        _LOGGER.info("Usunięto %s pasków LED", len(removed))
 
 
 class Stairs(LightEntity, RestoreEntity):
@@ -90,11 +121,14 @@ class Stairs(LightEntity, RestoreEntity):
             else:
                 self._state = False
 
+            # Wyłączone światło zapisuje jasność i kolor jako None
             if "brightness" in state.attributes:
-                self._brightness = state.attributes.get("brightness", 255)
+                self._brightness = state.attributes.get("brightness") or 255
 
             if "rgb_color" in state.attributes:
-                self._rgb_color = state.attributes.get("rgb_color", (255, 255, 255))
+                self._rgb_color = tuple(
+                    state.attributes.get("rgb_color") or (255, 255, 255)
+                )
 
             if "effect" in state.attributes:
                 self._effect = state.attributes.get("effect", "STROBE")
@@ -204,13 +238,11 @@ class Stairs(LightEntity, RestoreEntity):
     @property
     def effect_list(self) -> list[str]:
         """Lista dostępnych efektów."""
-        _LOGGER.debug("Zwracam effect_list: %s", self._effect_list)
         return self._effect_list
 
     @property
     def effect(self) -> str:
         """Aktualnie wybrany efekt."""
-        _LOGGER.debug("Zwracam effect: %s", self._effect)
         return self._effect
 
     @property
@@ -220,28 +252,37 @@ class Stairs(LightEntity, RestoreEntity):
 
     async def async_turn_on(self, **kwargs: vol.Any) -> None:
         """Włącz oświetlenie."""
-        _LOGGER.info("Turn on strip: %s", self._strip_number)
+        _LOGGER.debug("Turn on strip: %s", self._strip_number)
         brightness = kwargs.get(ATTR_BRIGHTNESS)
         rgb_color = kwargs.get(ATTR_RGB_COLOR)
         effect = kwargs.get(ATTR_EFFECT)
 
-        # Ustaw jasność, tylko jeśli podano
         if brightness is not None:
             self._brightness = brightness
-            _LOGGER.info("Otrzymano jasność: %s", self._brightness)
-            # Ustaw jasność na API, tylko jeśli się zmieniła
-            await self._api_client.async_set_brightness(
-                self._strip_number, self._brightness
-            )
+            _LOGGER.debug("Otrzymano jasność: %s", self._brightness)
 
-        # Ustaw kolor
         if rgb_color is not None:
-            _LOGGER.info("Otrzymano kolor RGB: %s", rgb_color)
+            _LOGGER.debug("Otrzymano kolor RGB: %s", rgb_color)
             self._rgb_color = rgb_color
-            await self._api_client.async_set_solid_color(
-                self._strip_number, self._rgb_color
-            )
-            # self._color_to_set = rgb_color
+
+        if self._api_client.packed_colors:
+            # Jedno żądanie z kolorem już przeskalowanym jasnością
+            if brightness is not None or rgb_color is not None:
+                await self._api_client.async_set_color(
+                    self._strip_number, self._rgb_color, self._brightness
+                )
+        else:
+            # Ustaw jasność na API, tylko jeśli podano
+            if brightness is not None:
+                await self._api_client.async_set_brightness(
+                    self._strip_number, self._brightness
+                )
+
+            # Ustaw kolor
+            if rgb_color is not None:
+                await self._api_client.async_set_solid_color(
+                    self._strip_number, self._rgb_color
+                )
 
         if effect is not None:
             _LOGGER.debug("Otrzymano efekt: %s", effect)
@@ -257,7 +298,7 @@ class Stairs(LightEntity, RestoreEntity):
 
     async def async_turn_off(self, **kwargs: vol.Any) -> None:
         """Wyłącz oświetlenie."""
-        _LOGGER.info("Turn off strip: %s", self._strip_number)
+        _LOGGER.debug("Turn off strip: %s", self._strip_number)
         self._state = False
         self._effect = None
 
@@ -268,13 +309,18 @@ class Stairs(LightEntity, RestoreEntity):
 
     def update_state_from_data(self, data):
         """Aktualizuje stan encji na podstawie danych z API."""
-        _LOGGER.info(f"Aktualizuje stan encji {self.entity_id}")
+        _LOGGER.debug("Aktualizuje stan encji %s", self.entity_id)
         if data:
             strip_data = data.get(str(self._strip_number))
             if strip_data:
                 self._state = strip_data.get("state") == "ON"
-                self._brightness = strip_data.get("brightness", self._brightness)
-                self._rgb_color = tuple(strip_data.get("rgb_color", self._rgb_color))
+                # W trybie spakowanym kontroler zna tylko kolor już przeskalowany
+                # jasnością i po korekcji, źródłem kolor i jasność pozostaje HA
+                if not self._api_client.packed_colors:
+                    self._brightness = strip_data.get("brightness", self._brightness)
+                    self._rgb_color = tuple(
+                        strip_data.get("rgb_color", self._rgb_color)
+                    )
                 self._effect = strip_data.get("effect", self._effect)
                 self._available = True
             else:
@@ -346,21 +392,52 @@ class Stairs(LightEntity, RestoreEntity):
     #     await self._api_client.async_set_effect(strip_number, effect)
 
 
-async def start_global_update_loop(hass: HomeAssistant, entities: tuple[Stairs]):
-    """Uruchamia globalną pętlę aktualizacji dla wszystkich encji."""
+@callback
+def start_global_update_loop(hass: HomeAssistant, entry_data: dict) -> CALLBACK_TYPE:
+    """Uruchamia globalną pętlę aktualizacji dla wszystkich encji.
+
+    Kolejny cykl planowany jest dopiero po zakończeniu poprzedniego, z aktualnym
+    interwałem z `entry_data`, więc zmiana opcji działa od następnego cyklu,
+    a wolny kontroler nie powoduje nakładania się zapytań. Zwraca funkcję
+    zatrzymującą pętlę.
+    """
+    cancel_next: CALLBACK_TYPE | None = None
+    stopped = False
+
+    @callback
+    def schedule_next() -> None:
+        nonlocal cancel_next
+        if not stopped:
+            cancel_next = async_call_later(
+                hass, entry_data["scan_interval"], update_all_entities
+            )
 
     async def update_all_entities(now):
         """Pobiera dane dla wszystkich pasków i aktualizuje encje."""
-        all_strip_data = await entities[0]._api_client.async_get_all_statuses()
-        is_available = await entities[0]._api_client.async_check_availability()
-
-        for entity in entities:
-            if is_available:
-                entity.update_state_from_data(all_strip_data)
-            else:
-                entity._available = False
-                entity._state = STATE_UNAVAILABLE
-                entity.async_write_ha_state()
+        api_client = entry_data["api_client"]
+        try:
+            all_strip_data = await api_client.async_get_all_statuses()
+            is_available = await api_client.async_check_availability()
+
+            # Lista encji może się zmienić w trakcie zapytań (zmiana opcji)
+            for entity in list(entry_data["entities"]):
+                if is_available:
+                    entity.update_state_from_data(all_strip_data)
+                else:
+                    entity._available = False
+                    entity._state = STATE_UNAVAILABLE
+                    entity.async_write_ha_state()
+        finally:
+            schedule_next()
+
+    @callback
+    def stop() -> None:
+        nonlocal stopped
+        _LOGGER.debug("Zatrzymuję globalną pętlę aktualizacji")
+        stopped = True
+        if cancel_next is not None:
+            cancel_next()
 
     _LOGGER.debug("Uruchamiam globalną pętlę aktualizacji")
-    async_track_time_interval(hass, update_all_entities, timedelta(seconds=5))
+    schedule_next()
+    return stop
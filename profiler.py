@@ -0,0 +1,127 @@
+"""Profilowanie pętli odpytywania i obsługi komend na żądanie."""
+
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Co ile sekund mierzymy opóźnienie pętli zdarzeń
+LAG_PROBE_INTERVAL = 0.1
+# Liczba najdroższych funkcji spoza integracji zwracanych w raporcie
+TOP_FUNCTIONS = 25
+
+_INTEGRATION_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROFILE_LOCK = asyncio.Lock()
+
+
+class StairsProfiler:
+    """Ograniczone czasowo profilowanie pętli zdarzeń HA."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Inicjalizacja profilera."""
+        self.hass = hass
+        self._lag_samples: list[float] = []
+        self._probe_handle: asyncio.TimerHandle | None = None
+
+    def _probe_lag(self, expected: float) -> None:
+        """Zapisuje, o ile później od zaplanowanego wywołano callback."""
+        loop = self.hass.loop
+        now = loop.time()
+        self._lag_samples.append(max(now - expected, 0.0))
+        next_run = now + LAG_PROBE_INTERVAL
+        self._probe_handle = loop.call_at(next_run, self._probe_lag, next_run)
+
+    async def async_run(self, duration: float) -> dict:
+        """Profiluje pętlę zdarzeń przez `duration` sekund i zwraca raport."""
+        if _PROFILE_LOCK.locked():
+            raise HomeAssistantError("Profilowanie jest już w toku")
+
+        async with _PROFILE_LOCK:
+            _LOGGER.info("Rozpoczynam profilowanie na %s s", duration)
+            loop = self.hass.loop
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:
+                # Inny profiler (np. integracja profiler) jest już aktywny
+                raise HomeAssistantError(
+                    f"Nie można uruchomić profilowania: {e}"
+                ) from e
+
+            started = time.monotonic()
+            first_run = loop.time() + LAG_PROBE_INTERVAL
+            self._probe_handle = loop.call_at(first_run, self._probe_lag, first_run)
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                profile.disable()
+                if self._probe_handle is not None:
+                    self._probe_handle.cancel()
+                    self._probe_handle = None
+            elapsed = time.monotonic() - started
+
+            report = await self.hass.async_add_executor_job(
+                _build_report, profile, self._lag_samples, elapsed
+            )
+            _LOGGER.info("Zakończono profilowanie po %.1f s", elapsed)
+            return report
+
+
+def _format_function(key: tuple[str, int, str]) -> str:
+    """Zwraca czytelny opis funkcji z klucza pstats."""
+    filename, lineno, funcname = key
+    if filename == "~":
+        return funcname
+    return f"{os.path.basename(filename)}:{lineno}({funcname})"
+
+
+def _function_entry(key: tuple[str, int, str], value: tuple) -> dict:
+    """Buduje wpis raportu dla jednej funkcji."""
+    primitive_calls, calls, total_time, cumulative_time, _callers = value
+    return {
+        "function": _format_function(key),
+        "calls": calls,
+        "primitive_calls": primitive_calls,
+        "total_time": round(total_time, 6),
+        "cumulative_time": round(cumulative_time, 6),
+    }
+
+
+def _build_report(
+    profile: cProfile.Profile, lag_samples: list[float], elapsed: float
+) -> dict:
+    """Przetwarza wyniki profilowania (wywoływane w executorze)."""
+    stats = pstats.Stats(profile).stats
+    by_cumulative = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+
+    integration = [
+        _function_entry(key, value)
+        for key, value in by_cumulative
+        if os.path.abspath(key[0]).startswith(_INTEGRATION_DIR + os.sep)
+    ]
+    top = [_function_entry(key, value) for key, value in by_cumulative[:TOP_FUNCTIONS]]
+
+    lag = sorted(lag_samples)
+    if lag:
+        lag_report = {
+            "samples": len(lag),
+            "mean": round(sum(lag) / len(lag), 6),
+            "p95": round(lag[min(int(len(lag) * 0.95), len(lag) - 1)], 6),
+            "max": round(lag[-1], 6),
+        }
+    else:
+        lag_report = {"samples": 0, "mean": None, "p95": None, "max": None}
+
+    return {
+        "duration": round(elapsed, 3),
+        "event_loop_lag": lag_report,
+        "integration_functions": integration,
+        "top_functions": top,
+    }
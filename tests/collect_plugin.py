@@ -0,0 +1,19 @@
+"""Wtyczka pytest zbierająca testy bez importu pakietu integracji."""
+
+from pathlib import Path
+
+import pytest
+
+_ROOT = Path(__file__).parent.parent
+
+
+def pytest_collect_directory(path: Path, parent: pytest.Collector):
+    """Zbiera katalog integracji jak zwykły katalog, nie jak pakiet.
+
+    Katalog główny repozytorium to sam pakiet integracji, a jego `__init__.py`
+    wymaga Home Assistant. Testy modułów niezależnych od HA (np. `color.py`)
+    nie powinny go importować.
+    """
+    if path == _ROOT:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
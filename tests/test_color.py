@@ -0,0 +1,95 @@
+"""Testy tablic korekcji kolorów."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# color.py nie zależy od Home Assistant, ładujemy go bez importu integracji
+_SPEC = importlib.util.spec_from_file_location(
+    "stairs_color", Path(__file__).parent.parent / "color.py"
+)
+color = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(color)
+
+
+def _reference(
+    rgb: tuple[int, int, int], brightness: int, gamma: float, correction
+) -> tuple[int, int, int]:
+    """Wynik liczony bez tablic, z jedną kwantyzacją."""
+    exact = [
+        channel_max * ((value / 255) * (brightness / 255)) ** gamma
+        for value, channel_max in zip(rgb, correction, strict=True)
+    ]
+    result = [round(value) for value in exact]
+    if max(exact) > 0 and not any(result):
+        result[exact.index(max(exact))] = 1
+    return tuple(result)
+
+
+@pytest.mark.parametrize(
+    ("gamma", "correction"), [(2.2, (255, 255, 255)), (1.8, (255, 176, 240))]
+)
+def test_apply_matches_reference(gamma, correction) -> None:
+    """Tablice dają ten sam wynik co obliczenie bezpośrednie."""
+    correction_tables = color.ColorCorrection(gamma, correction)
+    for brightness in range(256):
+        for value in range(256):
+            rgb = (value, value // 2, 255 - value)
+            assert correction_tables.apply(rgb, brightness) == _reference(
+                rgb, brightness, gamma, correction
+            )
+
+
+def test_brightness_fade_is_monotonic() -> None:
+    """Ściemnianie bieli daje rosnące wartości od 1 do 255."""
+    correction_tables = color.ColorCorrection(2.2, (255, 255, 255))
+    outputs = [correction_tables.apply((255, 255, 255), b)[0] for b in range(256)]
+
+    assert outputs == sorted(outputs)
+    assert outputs[0] == 0
+    assert min(outputs[1:]) == 1
+    assert outputs[255] == 255
+
+
+def test_single_quantization() -> None:
+    """Jasność nie jest zaokrąglana do 8 bitów przed korekcją gamma."""
+    correction_tables = color.ColorCorrection(2.2, (255, 255, 255))
+
+    # 255 * (128/255 * 96/255) ** 2.2 = 6.53; zaokrąglenie iloczynu do 48
+    # przed gamma dawało 255 * (48/255) ** 2.2 = 6.47, czyli 6
+    assert correction_tables.apply((128, 128, 128), 96) == (7, 7, 7)
+
+
+def test_apply_keeps_dim_color_lit() -> None:
+    """Przy niskiej jasności świeci tylko najjaśniejszy kanał."""
+    correction_tables = color.ColorCorrection(2.2, (255, 255, 255))
+
+    assert correction_tables.apply((255, 1, 0), 1) == (1, 0, 0)
+    assert correction_tables.apply((3, 255, 3), 1) == (0, 1, 0)
+    assert correction_tables.apply((255, 128, 0), 0) == (0, 0, 0)
+
+
+def test_apply_does_not_shift_hue() -> None:
+    """Słaby kanał nie jest podbijany, gdy kolor jest już widoczny."""
+    correction_tables = color.ColorCorrection(2.2, (255, 255, 255))
+
+    # Zielony: 255 * (3/255 * 40/255) ** 2.2 jest bliski zeru
+    assert correction_tables.apply((255, 3, 0), 40) == (4, 0, 0)
+
+
+def test_correction_limits_channels() -> None:
+    """Korekcja kolorów ogranicza maksimum każdego kanału."""
+    correction_tables = color.ColorCorrection(1.0, (255, 200, 100))
+
+    assert correction_tables.apply((255, 255, 255), 255) == (255, 200, 100)
+
+
+def test_encode_hex() -> None:
+    """Kolory są kodowane jako `rrggbb` w kolejności pasków."""
+    correction_tables = color.ColorCorrection(1.0, (255, 255, 255))
+
+    encoded = correction_tables.encode([((255, 0, 0), 255), ((0, 255, 16), 255)])
+
+    assert encoded == "ff000000ff10"
+    assert correction_tables.encode([]) == ""
@@ -0,0 +1,724 @@
+"""Test wytrzymałościowy (soak) integracji Stairs z zawodnym kontrolerem.
+
+Uruchamia prawdziwą instancję Home Assistant z integracją Stairs (klient API,
+pętla odpytywania i encje) przeciwko lokalnemu zastępczemu kontrolerowi, który
+wstrzykuje skoki opóźnień, zawieszenia, zerwane połączenia i niepoprawny JSON.
+Komendy są wysyłane przez usługi light.turn_on/turn_off, tak jak
+z automatyzacji. W trakcie mierzy opóźnienie pętli zdarzeń, liczbę zadań,
+przyrost pamięci (RSS) i liczbę niedokończonych komend. Kończy się kodem 1,
+gdy wykryje wyciek, nieograniczony przyrost kolejki albo nieobsłużony wyjątek
+z integracji, więc nadaje się do bramkowania wydań.
+
+Czas jest symulowany przez skalowanie: interwał odpytywania, opóźnienia
+kontrolera i odstępy między komendami dzielone są przez --time-scale.
+Limity czasu klienta HTTP nie są skalowane, dlatego awaria "timeout"
+(--timeout-stall) trwa w sekundach rzeczywistych i wydłuża przebieg.
+
+Przykład (2 godziny symulowanego czasu w ok. 36 s):
+
+    python tools/soak.py --hours 2 --time-scale 200
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+import json
+import logging
+import os
+import random
+import resource
+import socket
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+from aiohttp import web
+
+from homeassistant import bootstrap, runner
+from homeassistant.config_entries import SOURCE_USER
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_EFFECT,
+    ATTR_RGB_COLOR,
+    DOMAIN as LIGHT_DOMAIN,
+)
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    SERVICE_TURN_OFF,
+    SERVICE_TURN_ON,
+)
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger("stairs.soak")
+
+DOMAIN = "stairs"
+INTEGRATION_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Tak integracja jest widoczna w ścieżkach ramek po załadowaniu przez HA
+INTEGRATION_PATH = os.path.join("custom_components", DOMAIN) + os.sep
+
+LAG_PROBE_INTERVAL = 0.05
+EFFECTS = ["RAINBOW", "PULSE", "STROBE"]
+
+
+class FlakyController:
+    """Zastępczy kontroler LED z wstrzykiwaniem awarii.
+
+    Działa we własnym wątku i pętli zdarzeń, aby jego praca nie zaburzała
+    pomiaru opóźnienia pętli HA.
+    """
+
+    def __init__(self, args: argparse.Namespace, num_strips: int) -> None:
+        """Inicjalizacja kontrolera."""
+        self._args = args
+        self._random = random.Random(args.seed)
+        self.faults_enabled = True
+        self.requests: Counter[str] = Counter()
+        self.faults: Counter[str] = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._strips = {
+            str(i): {
+                "state": "OFF",
+                "brightness": 255,
+                "rgb_color": [255, 255, 255],
+                "effect": "STROBE",
+            }
+            for i in range(num_strips)
+        }
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self.port = self._sock.getsockname()[1]
+
+    def _delay(self, sim_seconds: float) -> float:
+        """Przelicza czas symulowany na rzeczywisty."""
+        return sim_seconds / self._args.time_scale
+
+    @web.middleware
+    async def _faults(self, request: web.Request, handler) -> web.StreamResponse:
+        """Wstrzykuje awarie przed obsługą żądania."""
+        args = self._args
+        self.requests[request.path] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay(args.base_latency))
+            if not self.faults_enabled:
+                return await handler(request)
+
+            # Progi kumulatywne: jedno losowanie wybiera co najwyżej jedną awarię
+            roll = self._random.random()
+            reset_below = args.reset_rate
+            timeout_below = reset_below + args.timeout_rate
+            hang_below = timeout_below + args.hang_rate
+            spike_below = hang_below + args.spike_rate
+            malformed_below = spike_below + args.malformed_rate
+
+            if roll < reset_below and request.transport is not None:
+                self.faults["reset"] += 1
+                request.transport.abort()
+                return web.Response(status=500)
+            if roll < timeout_below:
+                # Półmartwy kontroler: przestój w czasie rzeczywistym, dłuższy
+                # niż limity czasu klienta, więc nie jest skalowany
+                self.faults["timeout"] += 1
+                await asyncio.sleep(args.timeout_stall)
+            elif roll < hang_below:
+                # Kontroler przyjmuje połączenie, ale odpowiada bardzo późno
+                self.faults["hang"] += 1
+                await asyncio.sleep(self._delay(args.hang_time))
+            elif roll < spike_below:
+                self.faults["spike"] += 1
+                await asyncio.sleep(self._delay(args.spike_latency))
+            elif roll < malformed_below and request.method == "GET":
+                self.faults["malformed"] += 1
+                return web.Response(
+                    text='{"0": {"state": "ON", ', content_type="application/json"
+                )
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    async def _health(self, request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def _status_all(self, request: web.Request) -> web.Response:
+        return web.json_response(self._strips)
+
+    async def _status(self, request: web.Request) -> web.Response:
+        strip = self._strips.get(request.query.get("strip_number", ""))
+        if strip is None:
+            return web.Response(status=404)
+        return web.json_response(strip)
+
+    async def _packed_colors(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        colors = bytes.fromhex(payload["colors"])
+        for index, strip_number in enumerate(payload["step_numbers"]):
+            strip = self._strips.setdefault(
+                str(strip_number),
+                {"state": "OFF", "brightness": 255, "rgb_color": [255, 255, 255]},
+            )
+            strip["rgb_color"] = list(colors[index * 3 : index * 3 + 3])
+        return web.json_response({"status": "ok"})
+
+    async def _command(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        strip_number = payload.get("step_number", payload.get("strip_number"))
+        strip = self._strips.setdefault(
+            str(strip_number),
+            {"state": "OFF", "brightness": 255, "rgb_color": [255, 255, 255]},
+        )
+        path = request.path
+        if path.endswith("/turn_on"):
+            strip["state"] = "ON"
+        elif path.endswith("/turn_off"):
+            strip["state"] = "OFF"
+        elif path.endswith("/brightness"):
+            strip["brightness"] = payload["brightness"]
+        elif path.endswith("/solidcolor"):
+            strip["rgb_color"] = [payload["red"], payload["green"], payload["blue"]]
+        elif path.endswith("/effect"):
+            strip["effect"] = payload["effect"]
+        return web.json_response({"status": "ok"})
+
+    async def _serve(self, ready: threading.Event) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        app = web.Application(middlewares=[self._faults])
+        app.router.add_get("/api/health", self._health)
+        app.router.add_get("/api/led/status/all", self._status_all)
+        app.router.add_get("/api/led/status", self._status)
+        for path in (
+            "/api/animation/solidcolor",
+            "/api/brightness",
+            "/api/led/turn_on",
+            "/api/led/turn_off",
+            "/api/led/effect",
+        ):
+            app.router.add_post(path, self._command)
+        app.router.add_post("/api/animation/solidcolor/packed", self._packed_colors)
+
+        app_runner = web.AppRunner(app, access_log=None)
+        await app_runner.setup()
+        await web.SockSite(app_runner, self._sock).start()
+        ready.set()
+        await self._stop.wait()
+        await app_runner.cleanup()
+
+    def start(self) -> None:
+        """Uruchamia kontroler w osobnym wątku."""
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self._serve(ready),), daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+
+    def stop(self) -> None:
+        """Zatrzymuje kontroler."""
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+
+class ErrorCounter(logging.Handler):
+    """Zlicza błędy oraz nieobsłużone wyjątki z integracji.
+
+    Błędy połączenia logowane przez klienta API są przy wstrzykiwanych
+    awariach oczekiwane, więc tylko je zliczamy. Wyjątek, którego ślad
+    przechodzi przez kod integracji, oznacza brak obsługi błędu.
+    """
+
+    def __init__(self) -> None:
+        """Inicjalizacja."""
+        super().__init__(logging.ERROR)
+        self.counts: Counter[str] = Counter()
+        self.integration_exceptions: Counter[str] = Counter()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Zapamiętuje źródło błędu i wyjątki pochodzące z integracji."""
+        self.counts[record.name] += 1
+        if not record.exc_info or record.exc_info[1] is None:
+            return
+        exc = record.exc_info[1]
+        if record.name.startswith(f"custom_components.{DOMAIN}") or any(
+            INTEGRATION_PATH in frame.filename
+            for frame in traceback.extract_tb(exc.__traceback__)
+        ):
+            self.integration_exceptions[f"{type(exc).__name__}: {exc}"[:200]] += 1
+
+
+def _rss_bytes() -> int:
+    """Zwraca bieżące zużycie pamięci procesu (RSS)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Poza Linuksem dostępne jest tylko maksimum RSS
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+
+class SoakMetrics:
+    """Próbkowanie opóźnienia pętli, zadań i pamięci w pętli HA."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Inicjalizacja."""
+        self.hass = hass
+        self.lag: list[float] = []
+        self.samples: list[dict] = []
+        self.pending_commands: set[asyncio.Task] = set()
+        self.max_pending_commands = 0
+        self._probe_handle: asyncio.TimerHandle | None = None
+
+    def _probe_lag(self, expected: float) -> None:
+        loop = self.hass.loop
+        now = loop.time()
+        self.lag.append(max(now - expected, 0.0))
+        next_run = now + LAG_PROBE_INTERVAL
+        self._probe_handle = loop.call_at(next_run, self._probe_lag, next_run)
+
+    def start(self) -> None:
+        """Uruchamia sondę opóźnienia pętli."""
+        first_run = self.hass.loop.time() + LAG_PROBE_INTERVAL
+        self._probe_handle = self.hass.loop.call_at(
+            first_run, self._probe_lag, first_run
+        )
+
+    def stop(self) -> None:
+        """Zatrzymuje sondę opóźnienia pętli."""
+        if self._probe_handle is not None:
+            self._probe_handle.cancel()
+            self._probe_handle = None
+
+    def sample(self, sim_time: float) -> dict:
+        """Zapisuje bieżącą liczbę zadań, pamięć i kolejkę komend."""
+        sample = {
+            "sim_time": round(sim_time, 1),
+            "tasks": len(asyncio.all_tasks(self.hass.loop)),
+            "memory": _rss_bytes(),
+            "pending_commands": len(self.pending_commands),
+        }
+        self.samples.append(sample)
+        return sample
+
+    def track_command(self, task: asyncio.Task) -> None:
+        """Śledzi komendę do czasu jej zakończenia."""
+        self.pending_commands.add(task)
+        task.add_done_callback(self.pending_commands.discard)
+        self.max_pending_commands = max(
+            self.max_pending_commands, len(self.pending_commands)
+        )
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def _integration_tasks(loop: asyncio.AbstractEventLoop) -> list[asyncio.Task]:
+    """Zwraca niezakończone zadania, których korutyny pochodzą z integracji."""
+    tasks = []
+    for task in asyncio.all_tasks(loop):
+        code = getattr(task.get_coro(), "cr_code", None)
+        if code is not None and "custom_components" in code.co_filename:
+            if os.path.basename(os.path.dirname(code.co_filename)) == DOMAIN:
+                tasks.append(task)
+    return tasks
+
+
+async def _async_setup_hass(config_dir: str) -> HomeAssistant:
+    """Uruchamia minimalną instancję HA z integracją Stairs."""
+    custom_components = os.path.join(config_dir, "custom_components")
+    os.makedirs(custom_components)
+    os.symlink(INTEGRATION_DIR, os.path.join(custom_components, DOMAIN))
+    # Bez default_config, aby nie uruchamiać zbędnych integracji (np. http)
+    with open(
+        os.path.join(config_dir, "configuration.yaml"), "w", encoding="utf-8"
+    ) as config_file:
+        config_file.write("homeassistant:\n  name: Stairs soak\n")
+    if config_dir not in sys.path:
+        sys.path.insert(0, config_dir)
+
+    hass = await bootstrap.async_setup_hass(
+        runner.RuntimeConfig(config_dir=config_dir, skip_pip=True)
+    )
+    if hass is None:
+        raise RuntimeError("Nie udało się uruchomić Home Assistant")
+    await hass.async_start()
+    return hass
+
+
+async def _async_add_entry(hass: HomeAssistant, port: int, num_strips: int):
+    """Dodaje wpis konfiguracyjny przez config flow, tak jak użytkownik."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_HOST: "127.0.0.1", CONF_PORT: port, "led_strips": num_strips},
+    )
+    await hass.async_block_till_done()
+    return result["result"]
+
+
+def _issue_command(hass: HomeAssistant, metrics: SoakMetrics, rng, entities) -> None:
+    """Wywołuje usługę light dla losowej encji, tak jak automatyzacja."""
+    entity_ids = [entity.entity_id for entity in entities if entity.entity_id]
+    if not entity_ids:
+        return
+    service = SERVICE_TURN_ON
+    data = {ATTR_ENTITY_ID: rng.choice(entity_ids)}
+    action = rng.random()
+    if action < 0.2:
+        service = SERVICE_TURN_OFF
+    elif action < 0.5:
+        data[ATTR_BRIGHTNESS] = rng.randint(1, 255)
+    elif action < 0.8:
+        data[ATTR_RGB_COLOR] = [rng.randint(0, 255) for _ in range(3)]
+    else:
+        data[ATTR_EFFECT] = rng.choice(EFFECTS)
+    metrics.track_command(
+        hass.async_create_task(
+            hass.services.async_call(LIGHT_DOMAIN, service, data, blocking=True)
+        )
+    )
+
+
+async def async_soak(args: argparse.Namespace) -> int:
+    """Przeprowadza test i zwraca kod wyjścia."""
+    errors = ErrorCounter()
+    logging.getLogger().addHandler(errors)
+
+    controller = FlakyController(args, args.strips)
+    controller.start()
+
+    with tempfile.TemporaryDirectory(prefix="stairs-soak-") as config_dir:
+        hass = await _async_setup_hass(config_dir)
+        logging.getLogger().setLevel(args.log_level)
+        try:
+            return await _async_run(hass, controller, errors, args)
+        finally:
+            await hass.async_stop()
+            controller.stop()
+
+
+async def _async_run(
+    hass: HomeAssistant,
+    controller: FlakyController,
+    errors: ErrorCounter,
+    args: argparse.Namespace,
+) -> int:
+    """Główna część testu: rozgrzewka, soak, opróżnianie i wyładowanie."""
+    scale = args.time_scale
+    rng = random.Random(args.seed)
+    entry = await _async_add_entry(hass, controller.port, args.strips)
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+
+    # Interwał odpytywania ustawiamy bezpośrednio w opcjach wpisu, z pominięciem
+    # formularza opcji, bo przeskalowana wartość jest poniżej jego minimum 2 s
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            **entry.data,
+            CONF_SCAN_INTERVAL: args.scan_interval / scale,
+            "packed_colors": args.packed_colors,
+        },
+    )
+    await hass.async_block_till_done()
+
+    metrics = SoakMetrics(hass)
+    metrics.start()
+
+    duration = args.hours * 3600
+    warmup = min(args.warmup, duration / 2)
+    sample_every = args.sample_interval
+    next_sample = 0.0
+    next_command = 0.0
+    next_reconfigure = args.reconfigure_every or duration + 1
+    baseline: dict | None = None
+    started = time.monotonic()
+
+    while (sim_time := (time.monotonic() - started) * scale) < duration:
+        if sim_time >= next_command:
+            _issue_command(hass, metrics, rng, entry_data["entities"])
+            next_command += rng.expovariate(1 / args.command_interval)
+        if sim_time >= next_reconfigure:
+            # Na zmianę usuwamy i przywracamy część pasków
+            if len(entry_data["entities"]) < args.strips:
+                strips = args.strips
+            else:
+                strips = max(1, args.strips // 2)
+            hass.config_entries.async_update_entry(
+                entry, options={**entry.options, "led_strips": strips}
+            )
+            next_reconfigure += args.reconfigure_every
+        if sim_time >= next_sample:
+            sample = metrics.sample(sim_time)
+            # Punkt odniesienia dopiero po rozgrzewce i pierwszym odpytaniu:
+            # pierwszy cykl pętli używa jeszcze domyślnego, nieskalowanego
+            # interwału z konfiguracji wpisu
+            if (
+                baseline is None
+                and sim_time >= warmup
+                and controller.requests["/api/led/status/all"]
+            ):
+                baseline = sample
+            _LOGGER.info("Próbka: %s", sample)
+            next_sample += sample_every
+        await asyncio.sleep(min(0.01, 1 / scale))
+
+    # Opróżnianie: bez awarii i nowych komend wszystko powinno się zakończyć
+    controller.faults_enabled = False
+    drain_deadline = time.monotonic() + args.drain
+    while metrics.pending_commands and time.monotonic() < drain_deadline:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(2 * args.scan_interval / scale)
+    final = metrics.sample(duration)
+    metrics.stop()
+
+    # Po wyładowaniu wpisu nie może zostać żaden poller ani zadanie integracji
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    polls_before = controller.requests["/api/led/status/all"]
+    await asyncio.sleep(3 * args.scan_interval / scale)
+    polls_after_unload = controller.requests["/api/led/status/all"] - polls_before
+    leftover_tasks = _integration_tasks(hass.loop)
+
+    failures = []
+    if baseline is None:
+        failures.append("pętla nie odpytała kontrolera przed końcem testu")
+        baseline = metrics.samples[0]
+    memory_growth = final["memory"] - baseline["memory"]
+    task_growth = final["tasks"] - baseline["tasks"]
+    lag_p99 = _percentile(metrics.lag, 0.99)
+
+    if final["pending_commands"]:
+        failures.append(
+            f"{final['pending_commands']} komend nie zakończyło się po opróżnieniu"
+        )
+    if metrics.max_pending_commands > args.max_backlog:
+        failures.append(
+            f"kolejka komend osiągnęła {metrics.max_pending_commands}"
+            f" (limit {args.max_backlog})"
+        )
+    if task_growth > args.max_task_growth:
+        failures.append(
+            f"liczba zadań wzrosła o {task_growth} (limit {args.max_task_growth})"
+        )
+    if memory_growth > args.max_memory_growth * 1024:
+        failures.append(
+            f"pamięć wzrosła o {memory_growth / 1024:.0f} KiB"
+            f" (limit {args.max_memory_growth} KiB)"
+        )
+    if lag_p99 is not None and lag_p99 > args.max_loop_lag:
+        failures.append(
+            f"p99 opóźnienia pętli {lag_p99:.3f} s (limit {args.max_loop_lag} s)"
+        )
+    if polls_after_unload:
+        failures.append(f"{polls_after_unload} zapytań po wyładowaniu wpisu")
+    if leftover_tasks:
+        failures.append(f"{len(leftover_tasks)} zadań integracji po wyładowaniu")
+    if errors.integration_exceptions:
+        failures.append(
+            f"{sum(errors.integration_exceptions.values())}"
+            " nieobsłużonych wyjątków z integracji"
+        )
+
+    report = {
+        "simulated_hours": args.hours,
+        "real_seconds": round(time.monotonic() - started, 1),
+        "event_loop_lag": {
+            "samples": len(metrics.lag),
+            "p50": _percentile(metrics.lag, 0.5),
+            "p99": lag_p99,
+            "max": max(metrics.lag, default=None),
+        },
+        "tasks": {"baseline": baseline["tasks"], "final": final["tasks"]},
+        "memory": {
+            "baseline": baseline["memory"],
+            "final": final["memory"],
+            "growth": memory_growth,
+        },
+        "commands": {
+            "max_pending": metrics.max_pending_commands,
+            "final_pending": final["pending_commands"],
+        },
+        "controller": {
+            "requests": dict(controller.requests),
+            "faults": dict(controller.faults),
+            "max_in_flight": controller.max_in_flight,
+        },
+        "errors_logged": dict(errors.counts),
+        "integration_exceptions": dict(errors.integration_exceptions),
+        "failures": failures,
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if failures else 0
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sim = "sekundy symulowane"
+    parser.add_argument(
+        "--hours",
+        type=float,
+        default=2.0,
+        help="czas testu w godzinach symulowanych",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=100.0,
+        help="ile sekund symulowanych przypada na sekundę rzeczywistą",
+    )
+    parser.add_argument(
+        "--strips", type=int, default=16, help="liczba pasków LED we wpisie"
+    )
+    parser.add_argument(
+        "--scan-interval",
+        type=float,
+        default=5.0,
+        help=f"interwał odpytywania ({sim})",
+    )
+    parser.add_argument(
+        "--command-interval",
+        type=float,
+        default=2.0,
+        help=f"średni odstęp między komendami light ({sim})",
+    )
+    parser.add_argument(
+        "--reconfigure-every",
+        type=float,
+        default=1800.0,
+        help=f"co ile zmieniać liczbę pasków w opcjach, 0 wyłącza ({sim})",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="ziarno generatora liczb losowych"
+    )
+    parser.add_argument(
+        "--packed-colors", action="store_true", help="włącz tryb spakowanych kolorów"
+    )
+    faults = parser.add_argument_group(
+        "awarie kontrolera", "częstości to prawdopodobieństwo na jedno żądanie"
+    )
+    faults.add_argument(
+        "--base-latency",
+        type=float,
+        default=0.05,
+        help=f"opóźnienie każdej odpowiedzi ({sim})",
+    )
+    faults.add_argument(
+        "--spike-rate",
+        type=float,
+        default=0.05,
+        help="częstość skoków opóźnienia",
+    )
+    faults.add_argument(
+        "--spike-latency",
+        type=float,
+        default=3.0,
+        help=f"długość skoku opóźnienia ({sim})",
+    )
+    faults.add_argument(
+        "--timeout-rate",
+        type=float,
+        default=0.002,
+        help="częstość przestojów dłuższych niż limity czasu klienta",
+    )
+    faults.add_argument(
+        "--timeout-stall",
+        type=float,
+        default=7.0,
+        help="długość przestoju (sekundy rzeczywiste, nieskalowane; powyżej 5 s "
+        "limitu sprawdzania dostępności)",
+    )
+    faults.add_argument(
+        "--hang-rate",
+        type=float,
+        default=0.01,
+        help="częstość zawieszeń odpowiedzi",
+    )
+    faults.add_argument(
+        "--hang-time", type=float, default=60.0, help=f"długość zawieszenia ({sim})"
+    )
+    faults.add_argument(
+        "--reset-rate",
+        type=float,
+        default=0.01,
+        help="częstość zerwanych połączeń",
+    )
+    faults.add_argument(
+        "--malformed-rate",
+        type=float,
+        default=0.01,
+        help="częstość niepoprawnego JSON w odpowiedziach GET",
+    )
+    limits = parser.add_argument_group("pomiary i progi")
+    limits.add_argument(
+        "--warmup",
+        type=float,
+        default=300.0,
+        help=f"rozgrzewka przed punktem odniesienia ({sim})",
+    )
+    limits.add_argument(
+        "--sample-interval",
+        type=float,
+        default=60.0,
+        help=f"odstęp między próbkami zadań i pamięci ({sim})",
+    )
+    limits.add_argument(
+        "--drain",
+        type=float,
+        default=30.0,
+        help="czas na dokończenie komend po teście (sekundy rzeczywiste)",
+    )
+    limits.add_argument(
+        "--max-backlog",
+        type=int,
+        default=50,
+        help="maksymalna liczba jednocześnie niedokończonych komend",
+    )
+    limits.add_argument(
+        "--max-task-growth",
+        type=int,
+        default=5,
+        help="dopuszczalny przyrost liczby zadań względem punktu odniesienia",
+    )
+    limits.add_argument(
+        "--max-memory-growth",
+        type=int,
+        default=16384,
+        help="dopuszczalny przyrost RSS względem punktu odniesienia (KiB)",
+    )
+    limits.add_argument(
+        "--max-loop-lag",
+        type=float,
+        default=0.25,
+        help="dopuszczalny p99 opóźnienia pętli zdarzeń (sekundy rzeczywiste)",
+    )
+    parser.add_argument("--log-level", default="WARNING", help="poziom logowania")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Punkt wejścia."""
+    args = _parse_args(argv)
+    logging.basicConfig(level=args.log_level)
+    return asyncio.run(async_soak(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())